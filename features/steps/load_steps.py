@@ -34,14 +34,17 @@ HTTP_204_NO_CONTENT = 204
 def step_impl(context):
     """ Delete all Products and load new ones """
     #
-    # List all of the products and delete them one by one
+    # List all of the products page by page and delete them one by one
     #
     rest_endpoint = f"{context.base_url}/products"
-    context.resp = requests.get(rest_endpoint)
-    assert(context.resp.status_code == HTTP_200_OK)
-    for product in context.resp.json():
-        context.resp = requests.delete(f"{rest_endpoint}/{product['id']}")
-        assert(context.resp.status_code == HTTP_204_NO_CONTENT)
+    next_url = rest_endpoint
+    while next_url:
+        context.resp = requests.get(next_url)
+        assert(context.resp.status_code == HTTP_200_OK)
+        next_url = context.resp.links.get("next", {}).get("url")
+        for product in context.resp.json():
+            context.resp = requests.delete(f"{rest_endpoint}/{product['id']}")
+            assert(context.resp.status_code == HTTP_204_NO_CONTENT)
 
     #
     # load the database with new products
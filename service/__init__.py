@@ -23,8 +23,11 @@ and SQL database
 """
 import sys
 from flask import Flask
+from flask_caching import Cache
+from flask_compress import Compress
 from service import config
 from service.common import log_handlers
+from service.common.json_provider import OrjsonProvider
 
 # NOTE: Do not change the order of this code
 # The Flask app must be created
@@ -33,9 +36,18 @@ from service.common import log_handlers
 # Create the Flask aoo
 app = Flask(__name__)  # pylint: disable=invalid-name
 
+# Use orjson for all JSON encoding and decoding
+app.json = OrjsonProvider(app)
+
 # Load Configurations
 app.config.from_object(config)
 
+# Cache for idempotent responses
+cache = Cache(app)
+
+# Compress responses for clients that accept it
+Compress(app)
+
 # Dependencies require we import the routes AFTER the Flask app is created
 # pylint: disable=wrong-import-position, wrong-import-order, cyclic-import
 from service import routes, models        # noqa: F401, E402
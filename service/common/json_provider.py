@@ -0,0 +1,62 @@
+"""
+JSON Provider backed by orjson
+
+This module replaces Flask's default stdlib json encoder with orjson so
+that jsonify() and request.get_json() use the faster C implementation
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes and decodes with orjson"""
+
+    sort_keys = False
+
+    def _options(self, indent: bool = False, sort_keys: bool = None) -> int:
+        """Returns the orjson option flags for this provider"""
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serializes obj to a JSON formatted string
+
+        Accepts the same options as dumps_bytes()
+        """
+        return self.dumps_bytes(obj, **kwargs).decode()
+
+    def dumps_bytes(  # pylint: disable=too-many-arguments
+        self, obj, indent=None, sort_keys=None, default=None, separators=None, **kwargs
+    ) -> bytes:
+        """Serializes obj to JSON formatted UTF-8 bytes without decoding
+
+        Only the options orjson can honour are accepted: an indent of 2 spaces,
+        sort_keys, a default function and the compact (",", ":") separators
+        it always uses. Anything else raises a TypeError
+        """
+        if kwargs:
+            raise TypeError(f"Unsupported JSON options: {', '.join(sorted(kwargs))}")
+        if indent not in (None, 2):
+            raise TypeError(f"Unsupported JSON indent {indent!r}, only 2 is supported")
+        if separators not in (None, (",", ":")) or (separators and indent):
+            raise TypeError(f"Unsupported JSON separators {separators!r}")
+        option = self._options(indent=bool(indent), sort_keys=sort_keys)
+        return orjson.dumps(obj, default=default or self.default, option=option)
+
+    def loads(self, s, **kwargs):
+        """Deserializes a JSON formatted string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serializes the arguments straight to a bytes response body"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        option = self._options(indent) | orjson.OPT_APPEND_NEWLINE
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option),
+            mimetype=self.mimetype,
+        )
@@ -13,7 +13,33 @@ DATABASE_URI = os.getenv(
 # Configure SQLAlchemy
 SQLALCHEMY_DATABASE_URI = DATABASE_URI
 SQLALCHEMY_TRACK_MODIFICATIONS = False
-# SQLALCHEMY_POOL_SIZE = 2
+
+# Connection pool for each gunicorn worker process. The pool is sized to
+# match the worker's thread count so that 4 workers stay well below the
+# default PostgreSQL max_connections of 100
+SQLALCHEMY_ENGINE_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "8")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "4")),
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+# Configure Flask-Caching. The cache must be shared by every gunicorn worker,
+# so without Redis caching is turned off rather than kept in-process
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TYPE = "RedisCache" if REDIS_URL else "NullCache"
+CACHE_REDIS_URL = REDIS_URL
+CACHE_DEFAULT_TIMEOUT = 60
+
+# Configure Flask-Compress for the JSON responses and the static UI
+COMPRESS_MIMETYPES = [
+    "application/json",
+    "text/html",
+    "text/css",
+    "application/javascript",
+]
+COMPRESS_LEVEL = 6
+COMPRESS_MIN_SIZE = 500
 
 # Secret for session management
 SECRET_KEY = os.getenv("SECRET_KEY", "sup3r-s3cr3t")
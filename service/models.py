@@ -4,10 +4,15 @@
 # ...
 
 import logging
+import math
+from dataclasses import dataclass
 from enum import Enum
 from decimal import Decimal
+import fastjsonschema
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import select, bindparam
+from sqlalchemy.types import TypeDecorator, SmallInteger
 
 logger = logging.getLogger("flask.app")
 
@@ -35,48 +40,131 @@ class Category(Enum):
     TOOLS = 5
 
 
+class CategoryType(TypeDecorator):  # pylint: disable=too-many-ancestors
+    """Stores a Category as its integer value in a SMALLINT column"""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else Category(value).value
+
+    def process_literal_param(self, value, dialect):
+        return None if value is None else Category(value).value
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else Category(value)
+
+    @property
+    def python_type(self):
+        return Category
+
+
+# Generated validator for the dictionaries accepted by Product.deserialize
+_VALIDATE = fastjsonschema.compile(
+    {
+        "type": "object",
+        "required": ["name", "description", "price", "available", "category"],
+        "properties": {
+            "name": {"type": "string"},
+            "description": {"type": "string"},
+            "price": {
+                "type": ["string", "number"],
+                "pattern": r"^\s*[+-]?(\d+(\.\d*)?|\.\d+)\s*$",
+            },
+            "available": {"type": "boolean"},
+            "category": {"enum": [c.name for c in Category]},
+        },
+    }
+)
+
+
+@dataclass(frozen=True)
+class ProductDTO:
+    """Lightweight, read-only view of a Product used for list responses
+
+    orjson encodes dataclasses natively. Every field holds a JSON native type,
+    with the price already a string, so these are dumped to JSON without any
+    Python level work per row
+    """
+
+    __slots__ = ("id", "name", "description", "price", "available", "category")
+
+    id: int  # pylint: disable=invalid-name
+    name: str
+    description: str
+    price: str
+    available: bool
+    category: str
+
+    @classmethod
+    def from_row(cls, row) -> "ProductDTO":
+        """Creates a ProductDTO from a Row selected by Product.list_rows"""
+        product_id, name, description, price, available, category = row
+        return cls(product_id, name, description, str(price), available, category.name)
+
+
 class Product(db.Model):
     """Class that represents a Product"""
 
+    # category and availability are commonly filtered together
+    __table_args__ = (db.Index("ix_product_cat_avail", "category", "available"),)
+
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.String(250), nullable=False)
-    price = db.Column(db.Numeric, nullable=False)
+    price = db.Column(db.Numeric, nullable=False, index=True)
     available = db.Column(db.Boolean(), nullable=False, default=True)
     category = db.Column(
-        db.Enum(Category), nullable=False, server_default=(Category.UNKNOWN.name)
+        CategoryType(), nullable=False, server_default=str(Category.UNKNOWN.value)
     )
 
     def __repr__(self):
         return f"<Product {self.name} id=[{self.id}]>"
 
     def create(self):
-        """Creates a Product in the database"""
+        """Creates a Product in the database
+
+        Changes are flushed so that the id is assigned; the commit happens
+        once at the end of the request
+        """
         logger.info("Creating %s", self.name)
         self.id = None
         db.session.add(self)
-        db.session.commit()
+        db.session.flush()
+
+    @classmethod
+    def bulk_create(cls, products: list):
+        """Creates several Products in the database with batched INSERTs"""
+        logger.info("Creating %d products", len(products))
+        for product in products:
+            product.id = None
+        db.session.add_all(products)
+        db.session.flush()
 
     def update(self):
         """Updates a Product in the database"""
         logger.info("Saving %s", self.name)
         if not self.id:
             raise DataValidationError("Update called with empty ID field")
-        db.session.commit()
+        db.session.flush()
 
     def delete(self):
         """Removes a Product from the data store"""
         logger.info("Deleting %s", self.name)
         db.session.delete(self)
-        db.session.commit()
+        db.session.flush()
 
     def serialize(self) -> dict:
-        """Serializes a Product into a dictionary"""
+        """Serializes a Product into a dictionary
+
+        The price is left as a Decimal; the JSON provider encodes it as a string
+        """
         return {
             "id": self.id,
             "name": self.name,
             "description": self.description,
-            "price": str(self.price),
+            "price": self.price,
             "available": self.available,
             "category": self.category.name,
         }
@@ -84,24 +172,24 @@ class Product(db.Model):
     def deserialize(self, data: dict):
         """Deserializes a Product from a dictionary"""
         try:
-            self.name = data["name"]
-            self.description = data["description"]
-            self.price = Decimal(data["price"])
-            if isinstance(data["available"], bool):
-                self.available = data["available"]
-            else:
-                raise DataValidationError(
-                    f"Invalid type for boolean [available]: {type(data['available'])}"
-                )
-            self.category = getattr(Category, data["category"])
-        except AttributeError as error:
-            raise DataValidationError("Invalid attribute: " + error.args[0]) from error
-        except KeyError as error:
-            raise DataValidationError("Invalid product: missing " + error.args[0]) from error
-        except TypeError as error:
-            raise DataValidationError(
-                "Invalid product: body of request contained bad or no data " + str(error)
-            ) from error
+            _VALIDATE(data)
+        except fastjsonschema.JsonSchemaValueException as error:
+            raise DataValidationError("Invalid product: " + error.message) from error
+        price = data["price"]
+        if isinstance(price, float):
+            if not math.isfinite(price):
+                raise DataValidationError(f"Invalid product: price must be finite, not {price}")
+            # go through str() so 12.1 becomes 12.1 rather than its binary expansion
+            price = str(price)
+        elif isinstance(price, Decimal) and not price.is_finite():
+            raise DataValidationError(f"Invalid product: price must be finite, not {price}")
+        price = price if isinstance(price, Decimal) else Decimal(price)
+        # every check and conversion is done before any field is assigned
+        self.name = data["name"]
+        self.description = data["description"]
+        self.price = price
+        self.available = data["available"]
+        self.category = Category[data["category"]]
         return self
 
     @classmethod
@@ -115,17 +203,36 @@ class Product(db.Model):
     @classmethod
     def all(cls) -> list:
         """Returns all of the Products in the database"""
-        return cls.query.all()
+        return db.session.execute(_ALL).scalars().all()
+
+    @classmethod
+    def list_rows(cls, filter_spec: dict = None, after_id: int = None, limit: int = None) -> list:
+        """Returns the column values of the Products matching filter_spec
+
+        filter_spec maps column names to the value they must be equal to.
+        Results are ordered by id so they can be paged through with after_id,
+        the id of the last Product of the previous page, and limit.
+        ProductDTOs built from plain rows are returned instead of Product
+        instances to skip the ORM bookkeeping
+        """
+        stmt = _LIST_ROWS
+        for column, value in (filter_spec or {}).items():
+            stmt = stmt.where(getattr(cls, column) == value)
+        if after_id is not None:
+            stmt = stmt.where(cls.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [ProductDTO.from_row(row) for row in db.session.execute(stmt).all()]
 
     @classmethod
     def find(cls, product_id: int):
         """Finds a Product by its ID"""
-        return cls.query.get(product_id)
+        return db.session.get(cls, product_id)
 
     @classmethod
     def find_by_name(cls, name: str) -> list:
         """Returns all Products with the given name"""
-        return cls.query.filter(cls.name == name).all()
+        return db.session.execute(_FIND_BY_NAME, {"name": name}).scalars().all()
 
     @classmethod
     def find_by_price(cls, price: Decimal) -> list:
@@ -133,14 +240,33 @@ class Product(db.Model):
         price_value = price
         if isinstance(price, str):
             price_value = Decimal(price.strip(' "'))
-        return cls.query.filter(cls.price == price_value).all()
+        return db.session.execute(_FIND_BY_PRICE, {"price": price_value}).scalars().all()
 
     @classmethod
     def find_by_availability(cls, available: bool = True) -> list:
         """Returns all Products by their availability"""
-        return cls.query.filter(cls.available == available).all()
+        return db.session.execute(_FIND_BY_AVAILABILITY, {"available": available}).scalars().all()
 
     @classmethod
     def find_by_category(cls, category: Category = Category.UNKNOWN) -> list:
         """Returns all Products by their Category"""
-        return cls.query.filter(cls.category == category).all()
+        return db.session.execute(_FIND_BY_CATEGORY, {"category": category}).scalars().all()
+
+
+######################################################################
+# Prebuilt statements reused by the Product finders so that SQLAlchemy
+# can serve them from its compiled statement cache
+######################################################################
+_ALL = select(Product)
+_LIST_ROWS = select(
+    Product.id,
+    Product.name,
+    Product.description,
+    Product.price,
+    Product.available,
+    Product.category,
+).order_by(Product.id)
+_FIND_BY_NAME = select(Product).where(Product.name == bindparam("name"))
+_FIND_BY_PRICE = select(Product).where(Product.price == bindparam("price"))
+_FIND_BY_AVAILABILITY = select(Product).where(Product.available == bindparam("available"))
+_FIND_BY_CATEGORY = select(Product).where(Product.category == bindparam("category"))
@@ -8,10 +8,55 @@
 """
 Product Store Service with UI
 """
-from flask import jsonify, request, abort, url_for
-from service.models import Product, Category   # FIX: import Category
+import re
+from urllib.parse import urlencode
+from uuid import uuid4
+from flask import Response, jsonify, request, abort, g
+from service.models import Product, Category, db   # FIX: import Category
 from service.common import status  # HTTP Status Codes
-from . import app
+from . import app, cache
+
+# Lookup tables for the list_products query parameters
+_CATEGORY_BY_NAME = {c.name: c for c in Category}
+_AVAIL_TRUE = frozenset(("true", "yes", "1"))
+
+# Requests with these methods never change the database
+_READ_ONLY_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+# Page sizes for list_products and the form of their integer arguments
+_INTEGER = re.compile(r"-?[0-9]+")
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 200
+
+# Cached product lists are keyed on this version, replaced on every change
+PRODUCTS_CACHE_VERSION = "products:version"
+PRODUCTS_CACHE_TIMEOUT = 60
+
+
+######################################################################
+# T R A N S A C T I O N S
+######################################################################
+@app.after_request
+def commit_session(response):
+    """Commits the changes flushed while handling the request
+
+    Read-only requests never flush anything, so they skip the COMMIT round trip.
+    The products cache is invalidated after the commit; invalidation failures
+    are logged and do not change the response of an already saved change
+    """
+    if request.method not in _READ_ONLY_METHODS:
+        db.session.commit()
+        # only invalidate once the change is visible to other requests
+        if g.pop("products_changed", False):
+            invalidate_products_cache()
+    return response
+
+
+@app.teardown_request
+def rollback_session(error=None):
+    """Rolls back the changes of a request that raised an exception"""
+    if error is not None:
+        db.session.rollback()
 
 
 ######################################################################
@@ -37,13 +82,84 @@ def index():
 ######################################################################
 def check_content_type(content_type):
     """Checks that the media type is correct"""
-    if "Content-Type" not in request.headers:
+    if request.headers.get("Content-Type") != content_type:
         abort(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
               f"Content-Type must be {content_type}")
 
-    if request.headers["Content-Type"] != content_type:
-        abort(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-              f"Content-Type must be {content_type}")
+
+def call_cache(method, *args, **kwargs):
+    """Calls a cache method, logging backend failures instead of raising them
+
+    A cache outage degrades to uncached behaviour: the failed call returns None
+    """
+    try:
+        return method(*args, **kwargs)
+    except Exception:  # pylint: disable=broad-except
+        app.logger.exception("Cache %s failed", getattr(method, "__name__", method))
+        if app.debug:
+            raise
+    return None
+
+
+def products_cache_key():
+    """Returns the cache key for the current list_products request
+
+    None is returned when there is no cache version to key on, in which case
+    the request must not be cached
+    """
+    version = call_cache(cache.get, PRODUCTS_CACHE_VERSION)
+    if version is None:
+        # never fall back to a fixed version: entries stored under it before
+        # the key was evicted could be served again
+        call_cache(cache.add, PRODUCTS_CACHE_VERSION, uuid4().hex, timeout=0)
+        version = call_cache(cache.get, PRODUCTS_CACHE_VERSION)
+        if version is None:
+            return None
+    return f"products:{version}:{request.query_string.decode()}"
+
+
+def invalidate_products_cache():
+    """Makes every cached product list stale"""
+    call_cache(cache.set, PRODUCTS_CACHE_VERSION, uuid4().hex, timeout=0)
+
+
+def parse_category(category: str) -> Category:
+    """Converts a category query parameter into a Category"""
+    category_value = _CATEGORY_BY_NAME.get(category.upper())
+    if category_value is None:
+        abort(status.HTTP_400_BAD_REQUEST, f"Invalid category '{category}'.")
+    return category_value
+
+
+def parse_available(available: str) -> bool:
+    """Converts an available query parameter into a bool"""
+    return available.lower() in _AVAIL_TRUE
+
+
+def parse_int_arg(name: str, default: int = None) -> int:
+    """Returns an integer query parameter, aborting if it is not a number"""
+    value = request.args.get(name)
+    if not value:
+        return default
+    if not _INTEGER.fullmatch(value):
+        abort(status.HTTP_400_BAD_REQUEST, f"Query parameter '{name}' must be an integer.")
+    return int(value)
+
+
+def next_page_link(after_id: int, per_page: int) -> str:
+    """Returns a Link header pointing to the page after the given id"""
+    args = request.args.copy()
+    args["after_id"] = after_id
+    args["per_page"] = per_page
+    return f'<{request.base_url}?{urlencode(list(args.items(multi=True)))}>; rel="next"'
+
+
+# Maps each list_products query parameter to the parser for its value
+_FILTER_PARSERS = {
+    "name": str,
+    "category": parse_category,
+    "available": parse_available,
+}
 
 
 ######################################################################
@@ -56,9 +172,10 @@ def create_products():
     data = request.get_json()
     product = Product().deserialize(data)
     product.create()
+    g.products_changed = True
 
     message = product.serialize()
-    location_url = url_for("get_products", product_id=product.id, _external=True)  # FIX
+    location_url = f"{request.root_url}products/{product.id}"  # FIX
     return jsonify(message), status.HTTP_201_CREATED, {"Location": location_url}
 
 
@@ -68,23 +185,33 @@ def create_products():
 @app.route("/products", methods=["GET"])
 def list_products():
     """Returns a list of Products"""
-    name = request.args.get("name")
-    category = request.args.get("category")
-    available = request.args.get("available")
+    cache_key = products_cache_key()
+    cached = call_cache(cache.get, cache_key) if cache_key else None
+    if cached is not None:
+        body, headers = cached
+        return Response(body, status.HTTP_200_OK, headers, mimetype="application/json")
+
+    # every filter that is given is combined into a single query
+    filter_spec = {
+        field: parse(request.args[field])
+        for field, parse in _FILTER_PARSERS.items()
+        if request.args.get(field)
+    }
+    per_page = min(max(parse_int_arg("per_page", DEFAULT_PER_PAGE), 1), MAX_PER_PAGE)
+    after_id = parse_int_arg("after_id")
 
-    if name:
-        products = Product.find_by_name(name)
-    elif category:
-        category_value = getattr(Category, category.upper())
-        products = Product.find_by_category(category_value)
-    elif available:
-        available_value = available.lower() in ["true", "yes", "1"]
-        products = Product.find_by_availability(available_value)
-    else:
-        products = Product.all()
+    # keyset pagination seeks on the primary key rather than skipping rows.
+    # The page is not streamed: it is at most MAX_PER_PAGE rows, and the Link
+    # header needs the id of its last row before the body can be sent
+    products = Product.list_rows(filter_spec, after_id=after_id, limit=per_page)
+    headers = {}
+    if len(products) == per_page:
+        headers["Link"] = next_page_link(products[-1].id, per_page)
 
-    results = [p.serialize() for p in products]
-    return jsonify(results), status.HTTP_200_OK   # FIX
+    body = app.json.dumps_bytes(products)
+    if cache_key:
+        call_cache(cache.set, cache_key, (body, headers), timeout=PRODUCTS_CACHE_TIMEOUT)
+    return Response(body, status.HTTP_200_OK, headers, mimetype="application/json")
 
 
 ######################################################################
@@ -113,6 +240,7 @@ def update_products(product_id):
     product.deserialize(request.get_json())
     product.id = product_id
     product.update()
+    g.products_changed = True
     return jsonify(product.serialize()), status.HTTP_200_OK   # FIX
 
 
@@ -125,4 +253,5 @@ def delete_products(product_id):
     product = Product.find(product_id)
     if product:
         product.delete()
+        g.products_changed = True
     return "", status.HTTP_204_NO_CONTENT
@@ -33,6 +33,35 @@ $(function () {
         $("#flash_message").append(message);
     }
 
+    // Returns the URL of the rel="next" Link header, or null on the last page
+    function next_page_url(xhr) {
+        let link = xhr.getResponseHeader("Link");
+        let match = link ? link.match(/<([^>]*)>;\s*rel="next"/) : null;
+        return match ? match[1] : null;
+    }
+
+    // Gets every page of a product list by following the Link headers
+    function list_all_pages(url, products, done, fail) {
+        let ajax = $.ajax({
+            type: "GET",
+            url: url,
+            contentType: "application/json",
+            data: ''
+        })
+
+        ajax.done(function(res, textStatus, xhr){
+            products = products.concat(res);
+            let next_url = next_page_url(xhr);
+            if (next_url) {
+                list_all_pages(next_url, products, done, fail);
+            } else {
+                done(products);
+            }
+        });
+
+        ajax.fail(fail);
+    }
+
     // ****************************************
     // Create a Product
     // ****************************************
@@ -218,14 +247,7 @@ $(function () {
 
         $("#flash_message").empty();
 
-        let ajax = $.ajax({
-            type: "GET",
-            url: `/products?${queryString}`,
-            contentType: "application/json",
-            data: ''
-        })
-
-        ajax.done(function(res){
+        list_all_pages(`/products?${queryString}`, [], function(res){
             //alert(res.toSource())
             $("#search_results").empty();
             let table = '<table class="table table-striped" cellpadding="10">'
@@ -254,9 +276,7 @@ $(function () {
             }
 
             flash_message("Success")
-        });
-
-        ajax.fail(function(res){
+        }, function(res){
             flash_message(res.responseJSON.message)
         });
 
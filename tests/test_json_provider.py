@@ -0,0 +1,31 @@
+"""
+Test cases for the orjson JSON Provider
+"""
+from decimal import Decimal
+from unittest import TestCase
+from flask import Flask
+from service.common.json_provider import OrjsonProvider
+
+
+class TestOrjsonProvider(TestCase):
+    """Test the orjson JSON Provider"""
+
+    def setUp(self):
+        self.provider = OrjsonProvider(Flask(__name__))
+
+    def test_dumps(self):
+        """It should dump Decimals as strings"""
+        self.assertEqual(self.provider.dumps({"price": Decimal("1.50")}), '{"price":"1.50"}')
+
+    def test_dumps_options(self):
+        """It should honour the indent, sort_keys and default options"""
+        data = {"b": 1, "a": 2}
+        self.assertEqual(self.provider.dumps(data, sort_keys=True), '{"a":2,"b":1}')
+        self.assertEqual(self.provider.dumps(data, indent=2), '{\n  "b": 1,\n  "a": 2\n}')
+        self.assertEqual(self.provider.dumps({1j}, default=lambda value: "set"), '"set"')
+        self.assertEqual(self.provider.dumps(data, separators=(",", ":")), '{"b":1,"a":2}')
+
+    def test_dumps_unsupported_options(self):
+        """It should refuse options it cannot honour"""
+        self.assertRaises(TypeError, self.provider.dumps, {}, indent=4)
+        self.assertRaises(TypeError, self.provider.dumps, {}, separators=(", ", ": "))
@@ -0,0 +1,46 @@
+"""
+Base class for tests that run inside a rolled-back database transaction
+"""
+from unittest import TestCase
+from sqlalchemy import text
+from sqlalchemy.orm import scoped_session, sessionmaker
+from service.models import db
+
+
+class TransactionalTestCase(TestCase):
+    """Runs every test inside one outer transaction that is never committed
+
+    Subclasses must set up the app and create the tables before calling
+    setUpClass(). Each test runs in its own savepoint, which is rolled back
+    afterwards, so commits made by the code under test never reach the database
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Clears the product table and opens the outer transaction"""
+        db.session.execute(text("TRUNCATE TABLE product RESTART IDENTITY CASCADE"))
+        db.session.commit()
+
+        cls.connection = db.engine.connect()
+        cls.transaction = cls.connection.begin()
+        cls.session = db.session
+        db.session = scoped_session(
+            sessionmaker(bind=cls.connection, join_transaction_mode="create_savepoint")
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        """Rolls back the outer transaction and restores the session"""
+        db.session.remove()
+        db.session = cls.session
+        cls.transaction.rollback()
+        cls.connection.close()
+
+    def setUp(self):
+        """Starts the savepoint for this test"""
+        self.savepoint = self.connection.begin_nested()
+
+    def tearDown(self):
+        """Rolls back everything this test wrote"""
+        db.session.remove()
+        self.savepoint.rollback()